@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import random
+import aiohttp
+from typing import Dict, List
+from diskcache import Cache
+from apk_finder.base_apk_searcher import BaseAPKSearcher
+
+
+class AsyncGoogleAPKSearcher(BaseAPKSearcher):
+    """Async searcher hitting the Custom Search JSON REST endpoint directly.
+
+    Bypasses the blocking googleapiclient discovery build and fires whole
+    batches of queries concurrently over one aiohttp session, bounded by a
+    semaphore to stay inside the per-key QPS limit. 429/5xx responses are
+    retried with exponential backoff plus jitter. Answers share the same
+    on-disk cache scheme as GoogleAPKSearcher so repeat queries stay free.
+    """
+
+    BASE_URL = "https://www.googleapis.com/customsearch/v1"
+    CACHE_TTL = 7 * 86400  # seconds
+    MAX_ATTEMPTS = 4
+
+    def __init__(
+        self,
+        api_key: str = "",
+        search_engine_id: str = "",
+        max_concurrency: int = 5,
+        cache_dir: str = ".cse_cache",
+    ):
+        if api_key == "" or search_engine_id == "":
+            raise ValueError("API key and Search Engine ID must be provided.")
+
+        self._api_key = api_key
+        self._search_engine_id = search_engine_id
+        self.max_concurrency = max_concurrency
+        self._cache = Cache(cache_dir)
+
+    async def _search_one(
+        self,
+        session: aiohttp.ClientSession,
+        sem: asyncio.Semaphore,
+        query: str,
+        num_results: int,
+    ) -> List[Dict]:
+        """Fetch one query's results, retrying transient failures."""
+        cache_key = hashlib.sha256(f"{query}|{num_results}".encode()).hexdigest()
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = {
+            "q": query,
+            "cx": self._search_engine_id,
+            "key": self._api_key,
+            "num": num_results,
+        }
+
+        payload = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            async with sem:
+                async with session.get(self.BASE_URL, params=params) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        backoff = 2**attempt + random.random()
+                    else:
+                        resp.raise_for_status()
+                        payload = await resp.json()
+                        break
+            # Back off with the semaphore released, so a throttled query
+            # doesn't hold a concurrency slot while it waits
+            await asyncio.sleep(backoff)
+
+        if payload is None:
+            return []
+
+        results = []
+        for item in payload.get("items", []):
+            title = self.clean_title(item.get("title", ""))
+            results.append({"title": title, "snippet": item.get("snippet", "")})
+
+        self._cache.set(cache_key, results, expire=self.CACHE_TTL)
+        return results
+
+    async def search_apks_many(
+        self, queries: List[str], num_results: int = 10
+    ) -> List[List[Dict]]:
+        """Search a batch of queries concurrently.
+
+        Args:
+            queries (List[str]): Search queries.
+            num_results (int): Maximum number of results per query.
+
+        Returns:
+            List[List[Dict]]: Result lists in the same order as the queries.
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(
+                *[self._search_one(session, sem, q, num_results) for q in queries]
+            )
+
+    def search_apks(self, query: str, num_results: int = 10) -> List[Dict]:
+        """Search for APKs for a single query (synchronous entry point).
+
+        Args:
+            query (str): Search query.
+            num_results (int): Maximum number of results.
+
+        Returns:
+            List[Dict]: Each dict contains "title" and "snippet".
+        """
+        return asyncio.run(self.search_apks_many([query], num_results))[0]
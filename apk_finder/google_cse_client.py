@@ -1,16 +1,28 @@
+import hashlib
+from diskcache import Cache
 from googleapiclient.discovery import build
 from apk_finder.base_apk_searcher import BaseAPKSearcher
 
 
 class GoogleAPKSearcher(BaseAPKSearcher):
-    """Concrete implementation of BaseSearcher using Google Custom Search API."""
+    """Concrete implementation of BaseSearcher using Google Custom Search API.
 
-    def __init__(self, api_key: str = "", search_engine_id: str = ""):
+    Responses are cached on disk for a week: CSE queries are billed per
+    request, so repeat runs should never pay for (or wait on) a query that
+    was already answered.
+    """
+
+    CACHE_TTL = 7 * 86400  # seconds
+
+    def __init__(
+        self, api_key: str = "", search_engine_id: str = "", cache_dir: str = ".cse_cache"
+    ):
         if api_key == "" or search_engine_id == "":
             raise ValueError("API key and Search Engine ID must be provided.")
 
         self._service = build("customsearch", "v1", developerKey=api_key)
         self._search_engine_id = search_engine_id
+        self._cache = Cache(cache_dir)
 
     def search_apks(self, query: str, num_results: int = 10):
         """Search for APKs using Google Custom Search API.
@@ -22,6 +34,11 @@ class GoogleAPKSearcher(BaseAPKSearcher):
         Returns:
             List[Dict]: Each dict contains "title" and "snippet".
         """
+        cache_key = hashlib.sha256(f"{query}|{num_results}".encode()).hexdigest()
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         response = (
             self._service.cse()
             .list(q=query, cx=self._search_engine_id, num=num_results)
@@ -33,4 +50,6 @@ class GoogleAPKSearcher(BaseAPKSearcher):
             title = self.clean_title(item.get("title", ""))
             snippet = item.get("snippet", "")
             results.append({"title": title, "snippet": snippet})
+
+        self._cache.set(cache_key, results, expire=self.CACHE_TTL)
         return results
@@ -0,0 +1,150 @@
+# downloaders/async_downloader.py
+import asyncio
+import os
+import aiofiles
+import aiohttp
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse, unquote
+from tqdm.asyncio import tqdm
+
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class AsyncDownloader:
+    """
+    Asyncio-based downloader that multiplexes many HTTPS streams on one thread.
+
+    A single aiohttp session with a bounded connector replaces one thread per
+    download, so hundreds of in-flight requests cost neither thread stacks nor
+    GIL contention. Concurrency is capped with a semaphore.
+    """
+
+    HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (X11; Linux x86_64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "Referer": "https://www.apkmirror.com/",
+        "Accept": "*/*",
+        "Accept-Encoding": "gzip, br",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Connection": "keep-alive",
+    }
+
+    def __init__(self, download_dir: str, max_concurrency: int = 8):
+        self.download_dir = download_dir
+        self.max_concurrency = max_concurrency
+        os.makedirs(download_dir, exist_ok=True)
+
+    def _resolve_filename(
+        self, response: aiohttp.ClientResponse, filename: Optional[str]
+    ) -> str:
+        """
+        Determine the filename to save as from response headers or the final URL.
+
+        :param response: aiohttp response object
+        :param filename: Optional filename requested by the caller
+        :return: Determined filename
+        """
+        content_disp = response.headers.get("Content-Disposition", "")
+        if content_disp and "filename=" in content_disp:
+            parts = content_disp.split("filename=")
+            if len(parts) > 1:
+                header_name = parts[1].strip().strip('"').strip("'")
+                if header_name:
+                    return header_name
+
+        # Fall back to the extension of the final (post-redirect) URL
+        path = unquote(urlparse(str(response.url)).path)
+        extension = os.path.splitext(os.path.basename(path))[1]
+
+        if filename and (filename.endswith(".apk") or filename.endswith(".apkm")):
+            return filename
+        elif filename:
+            return f"{filename}{extension}" if extension else filename
+        return "downloaded_file.apk"
+
+    async def download_file(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        filename: Optional[str],
+        sem: asyncio.Semaphore,
+    ) -> str:
+        """
+        Download a single file, streaming chunks to disk without blocking the loop.
+
+        :param session: Shared aiohttp client session
+        :param url: URL of the file
+        :param filename: Optional filename to save as. Extension is auto-detected.
+        :param sem: Semaphore bounding the number of concurrent streams
+        :return: Path to downloaded file
+        """
+        async with sem:
+            async with session.get(url, headers=self.HEADERS) as response:
+                response.raise_for_status()
+
+                actual_filename = self._resolve_filename(response, filename)
+                filepath = os.path.join(self.download_dir, actual_filename)
+
+                async with aiofiles.open(filepath, "wb") as f:
+                    async for chunk in response.content.iter_chunked(1 << 16):
+                        await f.write(chunk)
+
+        return filepath
+
+    async def download_all(
+        self, download_tasks: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> List[Tuple[str, str]]:
+        """
+        Download a batch of (url, filename, fallback_url) tuples concurrently.
+
+        :param download_tasks: Tuples of (url, filename, fallback_url)
+        :return: (url, filepath) pairs for the files that downloaded successfully
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8)
+
+        async def _download_with_fallback(session, url, filename, fallback_url):
+            try:
+                return url, await self.download_file(session, url, filename, sem)
+            except Exception as e:
+                log.warning(f"Failed to download {filename}: {e}")
+                if fallback_url:
+                    log.info(f"Attempting fallback URL for {filename}...")
+                    return url, await self.download_file(
+                        session, fallback_url, filename, sem
+                    )
+                raise
+
+        downloaded = []
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                _download_with_fallback(session, url, filename, fallback_url)
+                for url, filename, fallback_url in download_tasks
+            ]
+            for future in tqdm.as_completed(
+                tasks, total=len(tasks), desc="Downloading APKs"
+            ):
+                try:
+                    url, filepath = await future
+                    downloaded.append((url, filepath))
+                    log.info(f"Downloaded: {filepath}")
+                except Exception as e:
+                    log.error(f"Download failed: {e}")
+
+        return downloaded
+
+    def run(
+        self, download_tasks: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> List[Tuple[str, str]]:
+        """
+        Synchronous entry point wrapping download_all in asyncio.run.
+
+        :param download_tasks: Tuples of (url, filename, fallback_url)
+        :return: (url, filepath) pairs for the files that downloaded successfully
+        """
+        return asyncio.run(self.download_all(download_tasks))
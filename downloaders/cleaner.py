@@ -1,10 +1,24 @@
 import zipfile
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
 
 class Cleaner:
+    # Memoizes container checks by (path, mtime, size) so re-scans of an
+    # unchanged file skip re-opening its central directory
+    _container_cache = {}
+
+    # Pipeline state living in the download directory that the cleanup
+    # pass must not treat as junk: the resume checkpoint registry and
+    # in-progress atomic-write temp files
+    _PRESERVED_FILES = frozenset({"checkpoint.json"})
+
     def __init__(self, target_dir: str):
         self._target_dir = target_dir
 
@@ -20,11 +34,53 @@ class Cleaner:
             bool: True if the file is an APKM container, False otherwise.
         """
         try:
+            stat = os.stat(file_path)
+            cache_key = (file_path, stat.st_mtime, stat.st_size)
+            cached = Cleaner._container_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             with zipfile.ZipFile(file_path, "r") as zf:
-                return "base.apk" in zf.namelist()
+                # O(1) central-directory lookup instead of building namelist()
+                try:
+                    zf.getinfo("base.apk")
+                    result = True
+                except KeyError:
+                    result = False
+
+            Cleaner._container_cache[cache_key] = result
+            return result
         except:
             return False
 
+    @staticmethod
+    def _copy_stream(src, dst) -> None:
+        """
+        Copy src to dst, preferring a zero-copy kernel path.
+
+        When both ends expose real file descriptors (e.g. a stored,
+        uncompressed member) and the platform supports it, the copy happens
+        entirely in the kernel via os.copy_file_range; otherwise it falls
+        back to shutil.copyfileobj with a 1 MiB buffer.
+
+        Args:
+            src: Readable file-like object.
+            dst: Writable file object opened in binary mode.
+        """
+        if hasattr(src, "fileno") and hasattr(os, "copy_file_range"):
+            try:
+                src_fd = src.fileno()
+                dst_fd = dst.fileno()
+            except (OSError, ValueError, AttributeError):
+                src_fd = None
+            if src_fd is not None:
+                while True:
+                    copied = os.copy_file_range(src_fd, dst_fd, 1024 * 1024)
+                    if copied == 0:
+                        return
+
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
     @staticmethod
     def _extract_base_apk_from_apkm(apkm_path: str, target_dir: str) -> Optional[str]:
         """
@@ -41,42 +97,30 @@ class Cleaner:
             file_name = os.path.basename(apkm_path)
             base_name = os.path.splitext(file_name)[0]  # Remove .apk extension
 
-            # Create a temporary extraction folder
-            temp_extract_dir = os.path.join(target_dir, f"_temp_{base_name}")
-            os.makedirs(temp_extract_dir, exist_ok=True)
+            # Create a new name for the extracted APK
+            new_apk_name = f"{base_name}_base.apk"
+            new_apk_path = os.path.join(target_dir, new_apk_name)
 
-            # Extract the APKM
+            # Stream only the base.apk member straight to its destination,
+            # skipping decompression of the split APKs and resources
             with zipfile.ZipFile(apkm_path, "r") as zf:
-                zf.extractall(temp_extract_dir)
-
-            # Find and rename base.apk
-            base_apk_path = os.path.join(temp_extract_dir, "base.apk")
-            if os.path.exists(base_apk_path):
-                # Create a new name for the extracted APK
-                new_apk_name = f"{base_name}_base.apk"
-                new_apk_path = os.path.join(target_dir, new_apk_name)
-
-                # Copy base.apk to target directory with new name
-                shutil.copy2(base_apk_path, new_apk_path)
+                try:
+                    zf.getinfo("base.apk")
+                except KeyError:
+                    log.warning(f"No base.apk found in {file_name}")
+                    return None
 
-                # Clean up temporary extraction folder
-                shutil.rmtree(temp_extract_dir)
+                with zf.open("base.apk") as src, open(new_apk_path, "wb") as dst:
+                    Cleaner._copy_stream(src, dst)
 
-                # Remove the original APKM file
-                os.remove(apkm_path)
+            # Remove the original APKM file
+            os.remove(apkm_path)
 
-                print(f"Extracted: {file_name} to {new_apk_name}")
-                return new_apk_name
-            else:
-                print(f"No base.apk found in {file_name}")
-                shutil.rmtree(temp_extract_dir)
-                return None
+            log.debug(f"Extracted: {file_name} to {new_apk_name}")
+            return new_apk_name
 
         except Exception as e:
-            print(f"Failed to process {os.path.basename(apkm_path)}: {e}")
-            # Clean up temp folder if it exists
-            if os.path.exists(temp_extract_dir):
-                shutil.rmtree(temp_extract_dir, ignore_errors=True)
+            log.warning(f"Failed to process {os.path.basename(apkm_path)}: {e}")
             return None
 
     @staticmethod
@@ -98,24 +142,34 @@ class Cleaner:
         apk_files = []
         apkm_files = []
         other_files = []
-
-        # Step 1: Scan and categorize all files
-        for filename in os.listdir(directory_path):
-            file_path = os.path.join(directory_path, filename)
-
-            if os.path.isdir(file_path):
-                continue  # Skip subdirectories
-
-            if filename.endswith(".apk"):
-                # Ensure the file is not misnamed APKM
-                if Cleaner._is_apkm_container(file_path):
-                    apkm_files.append(file_path)
+        temp_dirs = []
+
+        # Step 1: Scan and categorize all files in a single scandir pass,
+        # reusing the cached DirEntry stat instead of per-file isdir calls
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Remember stale temp folders for the final cleanup
+                    if entry.name.startswith("_temp_"):
+                        temp_dirs.append(entry.path)
+                    continue  # Skip subdirectories
+
+                if (
+                    entry.name in Cleaner._PRESERVED_FILES
+                    or entry.name.endswith(".tmp")
+                ):
+                    continue  # Keep resume state for the next run
+
+                if entry.name.endswith(".apk"):
+                    # Ensure the file is not misnamed APKM
+                    if Cleaner._is_apkm_container(entry.path):
+                        apkm_files.append(entry.path)
+                    else:
+                        apk_files.append(entry.name)
+                elif entry.name.endswith(".apkm"):
+                    apkm_files.append(entry.path)
                 else:
-                    apk_files.append(filename)
-            elif filename.endswith(".apkm"):
-                apkm_files.append(file_path)
-            else:
-                other_files.append(file_path)
+                    other_files.append(entry.path)
 
         print(
             f"Found: {len(apk_files)} APK(s), {len(apkm_files)} APKM(s), {len(other_files)} other file(s)"
@@ -125,23 +179,43 @@ class Cleaner:
         extracted_apks = []
         if apkm_files:
             print("\nExtracting APKM containers:")
-            for apkm_path in apkm_files:
-                extracted_name = Cleaner._extract_base_apk_from_apkm(
-                    apkm_path, directory_path
+            # zlib releases the GIL, so independent archives decompress in
+            # parallel across threads
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+                extracted_names = list(
+                    ex.map(
+                        lambda p: Cleaner._extract_base_apk_from_apkm(
+                            p, directory_path
+                        ),
+                        apkm_files,
+                    )
                 )
+            # Collect results after the map returns to keep the lists
+            # single-threaded
+            for extracted_name in extracted_names:
                 if extracted_name:
                     extracted_apks.append(extracted_name)
                     apk_files.append(extracted_name)  # Add to APK list for summary
 
-        # Step 3: Clean up non-APK files
+        # Step 3: Clean up non-APK files, fanning the unlinks across threads
+        # so slow (e.g. network) filesystems see many deletes in flight
+        def _try_remove(file_path):
+            try:
+                os.remove(file_path)
+                return file_path, None
+            except Exception as e:
+                return file_path, e
+
         if other_files:
             print(f"\nCleaning up {len(other_files)} non-APK file(s):")
-            for file_path in other_files:
-                try:
-                    os.remove(file_path)
-                    print(f"- Removed: {os.path.basename(file_path)}")
-                except Exception as e:
-                    print(f"Failed to remove {os.path.basename(file_path)}: {e}")
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                for file_path, error in ex.map(_try_remove, other_files):
+                    if error is None:
+                        log.debug(f"- Removed: {os.path.basename(file_path)}")
+                    else:
+                        log.warning(
+                            f"Failed to remove {os.path.basename(file_path)}: {error}"
+                        )
 
         # Step 4: Summary
         print("\n" + "=" * 50)
@@ -151,8 +225,9 @@ class Cleaner:
         print(f"Extracted APKs from APKMs: {len(extracted_apks)}")
         print(f"Non-APK files removed: {len(other_files)}")
 
-        # Show all APK files now in directory
-        final_apk_files = [f for f in os.listdir(directory_path) if f.endswith(".apk")]
+        # Show all APK files now in directory, from the in-memory state kept
+        # up to date during extraction instead of re-listing the directory
+        final_apk_files = sorted(apk_files)
 
         if final_apk_files:
             print(f"\nTotal APK files in directory: {len(final_apk_files)}")
@@ -163,12 +238,12 @@ class Cleaner:
                     prefix = "[+] "  # Mark extracted ones
                 print(f"{i}. {prefix}{apk}")
 
-        # Clean up any remaining temporary folders (in case of errors)
-        for item in os.listdir(directory_path):
-            item_path = os.path.join(directory_path, item)
-            if os.path.isdir(item_path) and item.startswith("_temp_"):
-                try:
-                    shutil.rmtree(item_path)
-                    print(f"\nCleaned up temporary folder: {item}")
-                except:
-                    pass
+        # Clean up any stale temporary folders found in the initial scan
+        if temp_dirs:
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                list(
+                    ex.map(
+                        lambda p: shutil.rmtree(p, ignore_errors=True), temp_dirs
+                    )
+                )
+            print(f"\nCleaned up {len(temp_dirs)} temporary folder(s)")
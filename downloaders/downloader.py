@@ -1,16 +1,68 @@
 # downloaders/downloader.py
 import os
+import re
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 from typing import Optional
 from urllib.parse import urlparse, unquote
 
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Matches a short file extension at the end of a URL path (before ?/#)
+_EXT_RE = re.compile(r"\.([A-Za-z0-9]{1,5})(?:\?|#|$)")
+
+
+class _ProgressWriter:
+    """File-like wrapper that forwards writes and updates a tqdm bar."""
+
+    def __init__(self, fileobj, pbar):
+        self._fileobj = fileobj
+        self._pbar = pbar
+
+    def write(self, data):
+        self._pbar.update(len(data))
+        return self._fileobj.write(data)
+
 
 class Downloader:
     def __init__(self, download_dir: str):
         self.download_dir = download_dir
         os.makedirs(download_dir, exist_ok=True)
 
+        # Pooled session so downloads reuse TCP/TLS connections and retry
+        # transient failures with exponential backoff
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (X11; Linux x86_64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/120.0.0.0 Safari/537.36"
+                ),
+                "Referer": "https://www.apkmirror.com/",
+                "Accept": "*/*",
+                "Accept-Encoding": "gzip, br",
+                "Accept-Language": "en-US,en;q=0.9",
+                "Connection": "keep-alive",
+            }
+        )
+
     def _extract_extension_from_url(self, url: str) -> Optional[str]:
         """
         Extract extension from URL path, handling encoded characters.
@@ -19,20 +71,10 @@ class Downloader:
         :return: Extracted filename or None
         """
         try:
-            # Parse URL into components
-            parsed = urlparse(url)
-            # Decode URL-encoded characters
-            path = unquote(parsed.path)
-            filename = os.path.basename(path)
-
-            # Remove query parameters if they somehow got included
-            if "?" in filename:
-                filename = filename.split("?")[0]
-
-            # Gets the file extension
-            extension = os.path.splitext(filename)[1]
-
-            return extension if extension else None
+            # Decode URL-encoded characters and match the extension directly
+            path = unquote(urlparse(url).path)
+            match = _EXT_RE.search(path)
+            return f".{match.group(1)}" if match else None
         except Exception:
             return None
 
@@ -73,6 +115,30 @@ class Downloader:
         else:
             return "downloaded_file.apk"
 
+    def _find_existing_partial(self, url: str, filename: str) -> Optional[str]:
+        """
+        Locate a previous run's file for this download, if any.
+
+        Finished files are written under the detected extension, not the
+        bare title, so probe every name this download could have been
+        saved as.
+
+        :param url: URL of the file (its extension is one candidate)
+        :param filename: Filename requested by the caller
+        :return: Path of the existing file, or None
+        """
+        candidates = [filename]
+        url_ext = self._extract_extension_from_url(url)
+        if url_ext:
+            candidates.append(f"{filename}{url_ext}")
+        candidates.extend([f"{filename}.apk", f"{filename}.apkm"])
+
+        for name in dict.fromkeys(candidates):
+            path = os.path.join(self.download_dir, name)
+            if os.path.exists(path):
+                return path
+        return None
+
     def download_file(self, url: str, filename: Optional[str] = None) -> str:
         """
         Downloads a file from a URL, automatically detecting the correct file extension.
@@ -81,38 +147,65 @@ class Downloader:
         :param filename: Optional filename to save as. Extension will be auto-detected.
         :return: Path to downloaded file
         """
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Referer": "https://www.apkmirror.com/",
-            "Accept": "*/*",
-        }
+        # Resume a partial download if a file from a previous run exists
+        headers = {}
+        resume_from = 0
+        partial_path = None
+        if filename:
+            partial_path = self._find_existing_partial(url, filename)
+            if partial_path:
+                resume_from = os.path.getsize(partial_path)
+                headers["Range"] = f"bytes={resume_from}-"
 
         # Stream download with allow_redirects to follow redirects
-        with requests.get(url, headers=headers, stream=True, allow_redirects=True) as r:
+        with self._session.get(
+            url, headers=headers, stream=True, allow_redirects=True, timeout=(10, 60)
+        ) as r:
+            # 416 means the file on disk already covers the full range
+            if resume_from and r.status_code == 416:
+                log.info(f"Already complete: {partial_path}")
+                return partial_path
+
             # Raise errors for HTTP codes
             r.raise_for_status()
 
-            # Determine the actual filename from response
-            actual_filename = self._get_filename_from_response(r, filename)
+            # Restart from scratch if the server ignored the Range header
+            if resume_from and r.status_code != 206:
+                resume_from = 0
 
-            filepath = os.path.join(self.download_dir, actual_filename)
+            if resume_from:
+                # Append to the very file whose size we measured
+                filepath = partial_path
+                actual_filename = os.path.basename(filepath)
+            else:
+                # Determine the actual filename from response
+                actual_filename = self._get_filename_from_response(r, filename)
+                filepath = os.path.join(self.download_dir, actual_filename)
 
             total_size = int(r.headers.get("content-length", 0))
-            chunk_size = 8192
 
             with (
-                open(filepath, "wb") as f,
+                open(filepath, "ab" if resume_from else "wb") as f,
                 tqdm(
-                    total=total_size, unit="B", unit_scale=True, desc=actual_filename
+                    total=total_size,
+                    unit="B",
+                    unit_scale=True,
+                    desc=actual_filename,
+                    mininterval=0.2,
                 ) as pbar,
             ):
-                for chunk in r.iter_content(chunk_size=chunk_size):
-                    f.write(chunk)
-                    pbar.update(len(chunk))
-
-        print(f"Downloaded: {filepath}")
+                # Reserve the blocks up front when the size is known, so the
+                # filesystem avoids per-write extent allocation (Linux only)
+                if total_size > 0 and not resume_from:
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, total_size)
+                    except (AttributeError, OSError):
+                        pass
+
+                # Copy in 1 MiB blocks in C instead of a Python chunk loop;
+                # decode_content keeps transparent gzip handling intact
+                r.raw.decode_content = True
+                shutil.copyfileobj(r.raw, _ProgressWriter(f, pbar), length=1024 * 1024)
+
+        log.info(f"Downloaded: {filepath}")
         return filepath
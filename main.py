@@ -1,16 +1,24 @@
 # main.py
 import os
-import json
-import time
+import re
+import queue
+import functools
+import orjson
+import ijson
+import asyncio
+import hashlib
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from dotenv import load_dotenv
 
 from query_snowballer.snowballer import QuerySnowballer
 from query_provider.google_provider import GoogleQueryFinder
-from apk_finder.google_cse_client import GoogleAPKSearcher
-from scrapers.apkmirror_scraper import APKMirrorScraper
+from apk_finder.async_google_cse_client import AsyncGoogleAPKSearcher
+from scrapers.async_apkmirror_scraper import AsyncAPKMirrorScraper
 from downloaders.downloader import Downloader
+from downloaders.async_downloader import AsyncDownloader
 from downloaders.cleaner import Cleaner
 from utils.config import (
     GOOGLE_API_KEY,
@@ -55,6 +63,17 @@ def find_and_save_queries():
         "mobile monitoring app",
     ]
 
+    # Cache the expansion keyed by a hash of the seed list: if these exact
+    # seeds were already expanded, skip the whole BFS and API burst
+    root, ext = os.path.splitext(EXPANDED_QUERIES_FILE)
+    seed_hash = hashlib.blake2b(orjson.dumps(seed_queries)).hexdigest()[:16]
+    hashed_file = f"{root}.{seed_hash}{ext}"
+
+    if os.path.exists(hashed_file):
+        all_queries = load_json(hashed_file)
+        print(f"Seeds unchanged; loaded {len(all_queries)} queries from {hashed_file}")
+        return all_queries
+
     provider = GoogleQueryFinder()
     snowballer = QuerySnowballer(
         provider=provider, max_depth=2, max_queries=50, per_query_limit=10
@@ -67,56 +86,128 @@ def find_and_save_queries():
         print("-", q)
 
     os.makedirs(os.path.dirname(EXPANDED_QUERIES_FILE), exist_ok=True)
-    with open(EXPANDED_QUERIES_FILE, "w") as f:
-        json.dump(all_queries, f, indent=2)
+    _atomic_write_json(hashed_file, all_queries)
+
+    # Keep the canonical filename pointing at the hashed artifact
+    try:
+        if os.path.islink(EXPANDED_QUERIES_FILE) or os.path.exists(
+            EXPANDED_QUERIES_FILE
+        ):
+            os.remove(EXPANDED_QUERIES_FILE)
+        os.symlink(os.path.basename(hashed_file), EXPANDED_QUERIES_FILE)
+    except OSError:
+        # Filesystems without symlinks get a plain copy of the file
+        _atomic_write_json(EXPANDED_QUERIES_FILE, all_queries)
 
     print(f"\nSaved expanded queries to {EXPANDED_QUERIES_FILE}")
     return all_queries
 
 
-def search_and_save_apks(queries, max_queries=10):
+def search_and_save_apks(queries, max_queries=10, max_concurrency=5):
     """Search Google Custom Search for APKs and save results."""
-    apk_searcher = GoogleAPKSearcher(GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID)
-    all_results = []
-
-    for query in tqdm(queries[:max_queries], desc="Searching APKs"):
-        time.sleep(3)
-        results = apk_searcher.search_apks(query, 5)
-        all_results.extend(results)
+    # Fire the whole batch concurrently; the searcher bounds in-flight
+    # requests with a semaphore and backs off on 429s
+    apk_searcher = AsyncGoogleAPKSearcher(
+        GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID, max_concurrency=max_concurrency
+    )
+    print(f"Searching APKs for {min(len(queries), max_queries)} queries...")
+    result_batches = asyncio.run(
+        apk_searcher.search_apks_many(queries[:max_queries], 5)
+    )
 
-    # Remove duplicates by title and clean text
-    seen_titles = set()
-    filtered = []
-    for r in all_results:
-        title = clean_text(r["title"].strip().lower())
-        snippet = clean_text(r.get("snippet", ""))
-        if title not in seen_titles:
-            seen_titles.add(title)
-            filtered.append({"title": title, "snippet": snippet})
+    # Dedupe in a single pass over the batches, keyed on the normalized
+    # title; the snippet of the first occurrence wins
+    seen = {}
+    for batch in result_batches:
+        for r in batch:
+            key = clean_text(r["title"]).lower()
+            if key not in seen:
+                seen[key] = clean_text(r.get("snippet", ""))
+    filtered = [{"title": k, "snippet": v} for k, v in seen.items()]
 
     os.makedirs(os.path.dirname(SEARCH_RESULTS_FILE), exist_ok=True)
-    with open(SEARCH_RESULTS_FILE, "w") as f:
-        json.dump(filtered, f, indent=2)
+    _atomic_write_json(SEARCH_RESULTS_FILE, filtered)
 
     print(f"\nSaved search results to {SEARCH_RESULTS_FILE}")
     return filtered
 
 
+async def scrape_apkmirror(filtered, max_concurrency=5):
+    """Scrape APKMirror for every search result on one event loop.
+
+    Each query's search -> download-link chain is 3-4 sequential round
+    trips; gathering them under a semaphore overlaps the waiting instead
+    of walking the queries serially.
+    """
+    scraper = AsyncAPKMirrorScraper(max_concurrency=max_concurrency)
+    captured_results = {}
+    all_apk_downloads = []
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(title):
+        async with sem:
+            try:
+                apk, _ = await scraper.search_and_download(title, captured_results)
+            except Exception as e:
+                # One failed query must not tear down the gather and lose
+                # every result already collected
+                print(f"Error scraping '{title}': {e}")
+                return None
+            return apk
+
+    try:
+        tasks = [_one(result["title"]) for result in filtered]
+        for future in tqdm(
+            asyncio.as_completed(tasks),
+            total=len(tasks),
+            desc="Obtaining APK info from APKMirror",
+        ):
+            apk = await future
+            if apk is not None:
+                all_apk_downloads.append(apk)
+    finally:
+        await scraper.aclose()
+
+    return all_apk_downloads
+
+
+# Collapses runs of whitespace/control characters in one C-level pass
+# (\s already covers \r, \n and \t)
+_WS_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
 def clean_text(text):
     """Remove problematic control characters from text."""
-    if not text:
-        return ""
-    # Remove carriage returns, newlines, tabs
-    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ")
-    # Optional: collapse multiple spaces
-    text = " ".join(text.split())
-    return text
+    return _WS_RE.sub(" ", text).strip() if text else ""
+
+
+def _atomic_write_json(file_path, obj):
+    """Write JSON to a temp file then atomically replace the target.
+
+    A crash mid-write leaves the previous file intact instead of a
+    truncated one that breaks the next run's load_json.
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, file_path)
 
 
 def load_json(file_path):
     """Load JSON data from file."""
-    with open(file_path, "r") as f:
-        return json.load(f)
+    with open(file_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def iter_json(file_path):
+    """Stream top-level items from a JSON array without loading it whole.
+
+    ijson parses incrementally, so consumers that only iterate (e.g. the
+    search-results print loop) stay at O(1) memory regardless of file size.
+    """
+    with open(file_path, "rb") as f:
+        yield from ijson.items(f, "item")
 
 
 def save_apk_downloads_to_file(apk_downloads, file_path):
@@ -136,13 +227,37 @@ def save_apk_downloads_to_file(apk_downloads, file_path):
         )
 
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w") as f:
-        json.dump(apk_data, f, indent=2)
+    _atomic_write_json(file_path, apk_data)
 
     print(f"\nSaved {len(apk_data)} APK downloads to {file_path}")
     return apk_data
 
 
+def _sha256_file(file_path):
+    """Compute the SHA-256 digest of a file in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_checkpoint(download_dir):
+    """Load the download checkpoint registry, or an empty one if missing."""
+    checkpoint_path = os.path.join(download_dir, "checkpoint.json")
+    if os.path.exists(checkpoint_path):
+        try:
+            return load_json(checkpoint_path)
+        except (ValueError, OSError):
+            print("Warning: corrupt checkpoint file, starting fresh")
+    return {}
+
+
+def save_checkpoint(download_dir, checkpoint):
+    """Atomically persist the download checkpoint registry."""
+    _atomic_write_json(os.path.join(download_dir, "checkpoint.json"), checkpoint)
+
+
 def download_apks_from_file(file_path, download_dir):
     """Download APKs from a saved JSON file."""
     if not os.path.exists(file_path):
@@ -157,31 +272,99 @@ def download_apks_from_file(file_path, download_dir):
         print("No APK downloads found in the file")
         return
 
-    downloader = Downloader(download_dir=download_dir)
+    # Skip URLs already recorded in the checkpoint with an intact file on disk
+    checkpoint = load_checkpoint(download_dir)
+    download_tasks = []
+    skipped = 0
+    for apk_info in apk_data:
+        url = apk_info.get("direct_download_url")
+        if not url:
+            continue
+        record = checkpoint.get(hashlib.sha256(url.encode()).hexdigest())
+        if (
+            record
+            and os.path.exists(record["path"])
+            and os.path.getsize(record["path"]) == record["size"]
+        ):
+            skipped += 1
+            continue
+        download_tasks.append(
+            (url, apk_info.get("title"), apk_info.get("fallback_download_url"))
+        )
+
+    if skipped:
+        print(f"Skipping {skipped} APK(s) already completed in checkpoint")
 
-    for apk_info in tqdm(apk_data, desc="Downloading APKs"):
-        if apk_info.get("direct_download_url"):
-            # Use title as filename or generate from URL
-            filename = apk_info.get("title")
-            download_url = apk_info["direct_download_url"]
-            fallback_url = apk_info.get("fallback_download_url")
+    # Downloads are network-bound, so multiplex them on one event loop
+    downloader = AsyncDownloader(download_dir=download_dir)
+    downloaded = downloader.run(download_tasks)
+    print(f"\nDownloaded {len(downloaded)} of {len(download_tasks)} APKs")
 
-            print(f"\nDownloading: {apk_info.get('title', 'Unknown')}")
-            print(f"URL: {download_url}")
-            print(f"Fallback URL: {fallback_url}")
+    # Record successes so an interrupted run resumes where it left off
+    for url, filepath in downloaded:
+        checkpoint[hashlib.sha256(url.encode()).hexdigest()] = {
+            "url": url,
+            "path": filepath,
+            "sha256": _sha256_file(filepath),
+            "size": os.path.getsize(filepath),
+        }
+    save_checkpoint(download_dir, checkpoint)
 
+
+def download_and_extract_apks(apk_downloads, download_dir, num_extractors=2):
+    """Download APKs and extract APKM containers concurrently.
+
+    Downloader threads put finished filepaths on a bounded queue; a small
+    pool of extractor threads consumes them, so network fetch overlaps zlib
+    decompression instead of running as two serial stages.
+    """
+    downloader = Downloader(download_dir=download_dir)
+    extract_queue = queue.Queue(maxsize=4)
+
+    def _extract_worker():
+        while True:
+            filepath = extract_queue.get()
+            if filepath is None:
+                extract_queue.task_done()
+                break
             try:
-                downloader.download_file(download_url, filename)
+                if Cleaner._is_apkm_container(filepath):
+                    Cleaner._extract_base_apk_from_apkm(filepath, download_dir)
+            finally:
+                extract_queue.task_done()
+
+    extractors = [
+        threading.Thread(target=_extract_worker) for _ in range(num_extractors)
+    ]
+    for t in extractors:
+        t.start()
+
+    def _download(apk):
+        filepath = downloader.download_file(apk.direct_download_url, apk.title)
+        extract_queue.put(filepath)
+        return filepath
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(_download, apk): apk.title
+            for apk in apk_downloads
+            if apk.direct_download_url
+        }
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc="Downloading APKs"
+        ):
+            filename = futures[future]
+            try:
+                future.result()
                 print(f"Downloaded: {filename}")
             except Exception as e:
-                print(f"Failed to download: {e}")
-                if fallback_url:
-                    print("Attempting fallback URL...")
-                    try:
-                        downloader.download_file(fallback_url, filename)
-                        print(f"Downloaded via fallback: {filename}")
-                    except Exception as e2:
-                        print(f"Fallback download failed: {e2}")
+                print(f"Failed to download {filename}: {e}")
+
+    # All downloads done (executor shutdown waited); signal end-of-stream
+    for _ in extractors:
+        extract_queue.put(None)
+    for t in extractors:
+        t.join()
 
 
 def main():
@@ -267,33 +450,39 @@ def main():
     if args.search_apks and queries:
         filtered = search_and_save_apks(queries)
     elif args.load_results:
-        filtered = load_json(SEARCH_RESULTS_FILE)
-        print(f"Loaded {len(filtered)} APK search results from {SEARCH_RESULTS_FILE}")
+        if args.scrape_apkmirror:
+            filtered = load_json(SEARCH_RESULTS_FILE)
+            print(
+                f"Loaded {len(filtered)} APK search results from {SEARCH_RESULTS_FILE}"
+            )
+        else:
+            # Only printed below, never re-used: stream items so the whole
+            # file never has to sit in memory at once
+            filtered = iter_json(SEARCH_RESULTS_FILE)
+            print(f"Streaming APK search results from {SEARCH_RESULTS_FILE}")
 
     # Step 3: Print search results
     if filtered:
         print(f"\n{'=' * 50}")
-        print(f"SEARCH RESULTS ({len(filtered)} items):")
+        if isinstance(filtered, list):
+            print(f"SEARCH RESULTS ({len(filtered)} items):")
+        else:
+            print("SEARCH RESULTS:")
         print(f"{'=' * 50}")
+        shown = 0
         for i in filtered:
             print(f"\nTitle: {i['title']} \nSnippet: {i['snippet'][:100]}...")
+            shown += 1
+        if not isinstance(filtered, list):
+            print(f"\n{shown} search results.")
 
     # Step 4: APKMirror scraping
     if args.scrape_apkmirror and filtered:
-        scraper = APKMirrorScraper()
-        all_apk_downloads = []
-        captured_results = {}
-
         print(f"\n{'=' * 50}")
         print("SCRAPING APKMIRROR")
         print(f"{'=' * 50}")
 
-        for result in tqdm(filtered, desc="Obtaining APK info from APKMirror"):
-            apk, captured_results = scraper.search_and_download(
-                result["title"], captured_results
-            )
-            if apk is not None:
-                all_apk_downloads.append(apk)
+        all_apk_downloads = asyncio.run(scrape_apkmirror(filtered))
 
         print(f"\nScraping complete. Found {len(all_apk_downloads)} APKs.")
 
@@ -310,16 +499,31 @@ def main():
             print(f"\n{'=' * 50}")
             print("DIRECT DOWNLOAD")
             print(f"{'=' * 50}")
-            downloader = Downloader(download_dir=DOWNLOAD_DIRECTORY)
-            for apk in all_apk_downloads:
-                if apk.direct_download_url:
-                    filename = f"{apk.title}"
-                    print(f"\nDownloading: {filename}")
-                    try:
-                        downloader.download_file(apk.direct_download_url, filename)
-                        print(f"Downloaded: {filename}")
-                    except Exception as e:
-                        print(f"Failed: {e}")
+            if args.cleanup:
+                # Overlap network fetch with APKM extraction; the remaining
+                # directory cleanup still runs in Step 6
+                download_and_extract_apks(all_apk_downloads, DOWNLOAD_DIRECTORY)
+            else:
+                downloader = Downloader(download_dir=DOWNLOAD_DIRECTORY)
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    futures = {
+                        executor.submit(
+                            downloader.download_file, apk.direct_download_url, apk.title
+                        ): apk.title
+                        for apk in all_apk_downloads
+                        if apk.direct_download_url
+                    }
+                    for future in tqdm(
+                        as_completed(futures),
+                        total=len(futures),
+                        desc="Downloading APKs",
+                    ):
+                        filename = futures[future]
+                        try:
+                            future.result()
+                            print(f"Downloaded: {filename}")
+                        except Exception as e:
+                            print(f"Failed to download {filename}: {e}")
 
     # Step 5: Load from file and download
     if args.load_and_download:
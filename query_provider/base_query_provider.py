@@ -1,4 +1,24 @@
+import ahocorasick
+
+
+def _build_automaton(words: tuple[str, ...]) -> "ahocorasick.Automaton":
+    """Builds an Aho-Corasick automaton over the blacklist terms.
+
+    One DFA pass scans for all needles at once in C, so the cost per
+    suggestion stays O(len) no matter how large the blacklist grows.
+    """
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, len(word))
+    automaton.make_automaton()
+    return automaton
+
+
 class QueryProvider:
+    _BLACKLIST = ("ipad", "iphone", "ios", "apple")
+    # Built once at class definition; shared by every provider instance
+    _BLACKLIST_AUTOMATON = _build_automaton(_BLACKLIST)
+
     def get_related_queries(self, query: str, query_limit: int) -> list[str]:
         """
         Interface to get related search queries and output them as a list of strings.
@@ -12,6 +32,21 @@ class QueryProvider:
         """
         raise NotImplementedError("This method should be overridden by subclasses.")
 
+    def _is_blacklisted(self, suggestion: str) -> bool:
+        """Checks whether a suggestion contains a blacklisted term.
+
+        Matches are confirmed against word boundaries so that e.g.
+        "bioscope" does not count as containing "ios".
+        """
+        text = suggestion.lower()
+        for end, length in self._BLACKLIST_AUTOMATON.iter(text):
+            start = end - length + 1
+            before_ok = start == 0 or not text[start - 1].isalnum()
+            after_ok = end == len(text) - 1 or not text[end + 1].isalnum()
+            if before_ok and after_ok:
+                return True
+        return False
+
     def filter_queries(self, suggestions: list[str]) -> list[str]:
         """
         Filters the list of queries to ensure it does not contain blacklisted terms.
@@ -22,10 +57,4 @@ class QueryProvider:
         Returns:
         A filtered list of suggested strings
         """
-        blacklist = {"ipad", "iphone", "ios", "apple"}
-
-        filtered_queries = [
-            s for s in suggestions if not any(b in s.lower() for b in blacklist)
-        ]
-
-        return filtered_queries
+        return [s for s in suggestions if not self._is_blacklisted(s)]
@@ -1,6 +1,16 @@
 from googleapiclient.discovery import build
 from .base_query_provider import QueryProvider
+import asyncio
+import time
+import aiohttp
 import requests
+from diskcache import Cache
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from dotenv import load_dotenv
 from typing import List
 import os
@@ -17,14 +27,32 @@ class GoogleQueryFinder(QueryProvider):
 
     Attributes:
         _url (str): Base URL for Google Suggest API requests.
+        _cache: Persistent on-disk cache of suggestion lists, so warm
+                re-runs answer repeated queries without a network round trip.
     """
 
+    CACHE_TTL = 7 * 86400  # seconds
+
     def __init__(self):
         self._url = "https://suggestqueries.google.com/complete/search"
+        self._cache = Cache(
+            os.path.join(os.path.expanduser("~"), ".cache", "mta_suggest")
+        )
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        retry=retry_if_exception_type(
+            (requests.HTTPError, requests.ConnectionError)
+        ),
+    )
     def get_related_queries(self, query: str, query_limit: int = 10) -> List[str]:
         """
-        Fetches related search queries using the google suggest query API
+        Fetches related search queries using the google suggest query API.
+
+        Transient failures (429/5xx, dropped connections) are retried up to
+        three times with exponential backoff and jitter instead of dropping
+        the query from the BFS.
 
         Parameters:
         query (str): The search query to get related queries for.
@@ -34,11 +62,109 @@ class GoogleQueryFinder(QueryProvider):
         List[str]: A list of related search queries.
         """
 
-        params = {"client": "firefox", "q": query}
+        cache_key = (query.lower().strip(), query_limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = {"client": "firefox", "q": query, "nolabels": "t"}
         resp = requests.get(self._url, params=params)
+        if resp.status_code == 429:
+            # Honor the server's backoff hint before tenacity retries
+            time.sleep(int(resp.headers.get("Retry-After", "1")))
+        resp.raise_for_status()
         suggestions = resp.json()[1]  # second element has suggestions
-        suggestions = suggestions[:10]  # truncates to the query_limit
+        suggestions = suggestions[:query_limit]  # truncates to the query_limit
 
         suggestions = self.filter_queries(suggestions)
 
+        # Only cache non-empty answers; misses may be transient
+        if suggestions:
+            self._cache.set(cache_key, suggestions, expire=self.CACHE_TTL)
+
         return suggestions
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        retry=retry_if_exception_type(
+            (aiohttp.ClientResponseError, aiohttp.ClientConnectionError)
+        ),
+    )
+    async def _fetch(
+        self,
+        session: "aiohttp.ClientSession",
+        query: str,
+        query_limit: int,
+        sem: asyncio.Semaphore,
+    ) -> List[str]:
+        """
+        Fetches related queries for one query on a shared aiohttp session.
+
+        Transient failures are retried with exponential backoff and jitter,
+        mirroring the sync path; tenacity applies the same decorator to
+        coroutines.
+
+        Parameters:
+        session: Shared aiohttp client session.
+        query (str): The search query to get related queries for.
+        query_limit (int): The maximum number of related queries to return.
+        sem: Semaphore bounding concurrent requests to respect rate caps.
+
+        Returns:
+        List[str]: A list of related search queries.
+        """
+        cache_key = (query.lower().strip(), query_limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = {"client": "firefox", "q": query, "nolabels": "t"}
+        async with sem:
+            async with session.get(self._url, params=params) as resp:
+                if resp.status == 429:
+                    # Honor the server's backoff hint before tenacity retries
+                    await asyncio.sleep(int(resp.headers.get("Retry-After", "1")))
+                resp.raise_for_status()
+                # Google Suggest serves JSON with a text/javascript type
+                payload = await resp.json(content_type=None)
+
+        suggestions = self.filter_queries(payload[1][:query_limit])
+        if suggestions:
+            self._cache.set(cache_key, suggestions, expire=self.CACHE_TTL)
+
+        return suggestions
+
+    async def get_related_queries_many(
+        self, queries: List[str], query_limit: int = 10
+    ) -> List[List[str]]:
+        """
+        Fetches related queries for a whole batch concurrently.
+
+        The workload is pure network I/O, so one session with a bounded
+        connector and semaphore turns N round trips into roughly one.
+
+        Parameters:
+        queries (List[str]): The queries to expand.
+        query_limit (int): The maximum number of related queries per query.
+
+        Returns:
+        List[List[str]]: Related queries, in the same order as the input.
+        """
+        sem = asyncio.Semaphore(10)
+        connector = aiohttp.TCPConnector(limit=20)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(
+                *[self._fetch(session, q, query_limit, sem) for q in queries],
+                return_exceptions=True,
+            )
+
+        # Drop only the failing queries, not the whole level
+        related_lists: List[List[str]] = []
+        for query, result in zip(queries, results):
+            if isinstance(result, BaseException):
+                print(f"[GoogleQueryFinder] Error fetching '{query}': {result}")
+                related_lists.append([])
+            else:
+                related_lists.append(result)
+        return related_lists
@@ -5,16 +5,18 @@ Expands search queries using any SearchProvider implementation.
 
 This module performs:
     - Controlled BFS expansion of a query graph (seed query are roots and then expand trees from there)
+    - Concurrent fetching of whole BFS levels when the provider supports it
     - Cycle detection
     - Depth limiting
     - Optional per-query expansion limit
 """
 
-from typing import List, Set, Dict
-from collections import deque
-import time
+from typing import List, Set
+import asyncio
 from tqdm import tqdm
 
+from utils.rate_limiter import TokenBucket
+
 
 class QuerySnowballer:
     """Performs BFS-based query expansion using a related query provider.
@@ -22,7 +24,9 @@ class QuerySnowballer:
     QuerySnowballer iteratively expands a set of seed queries by fetching
     related queries from a `provider` (e.g., GoogleQueryFinder). It performs
     a breadth-first search (BFS) to a maximum depth, respecting global and
-    per-query limits.
+    per-query limits. When the provider exposes an async
+    `get_related_queries_many`, each BFS level is dispatched in one
+    concurrent batch instead of one blocking request per query.
 
     Attributes:
         provider: An instance of SearchProvider (e.g. GoogleSearchProvider) provider implementing
@@ -43,14 +47,51 @@ class QuerySnowballer:
         self.max_depth = max_depth
         self.max_queries = max_queries
         self.per_query_limit = per_query_limit
+        # 5 requests/second for the serial fallback path; only waits when
+        # the budget is actually exhausted
+        self._limiter = TokenBucket(rate=5, burst=1)
+
+    def _fetch_level(self, level: List[str]) -> List[List[str]]:
+        """Fetches related queries for one BFS level.
+
+        Uses the provider's concurrent batch API when available; otherwise
+        falls back to serial, rate-limited calls.
+
+        Args:
+            level (List[str]): Queries making up the current BFS level.
+
+        Returns:
+            List[List[str]]: One related-query list per input query.
+        """
+        if hasattr(self.provider, "get_related_queries_many"):
+            try:
+                return asyncio.run(
+                    self.provider.get_related_queries_many(level, self.per_query_limit)
+                )
+            except Exception as e:
+                print(f"[Snowballer] Error fetching level: {e}")
+                return []
+
+        related_lists = []
+        for query in level:
+            self._limiter.acquire()
+            try:
+                related_lists.append(
+                    self.provider.get_related_queries(query, self.per_query_limit)
+                )
+            except Exception as e:
+                print(f"[Snowballer] Error fetching '{query}': {e}")
+
+        return related_lists
 
     def expand(self, seed_queries: List[str]) -> List[str]:
         """Expands a list of seed queries using BFS and the query provider.
 
-        Iteratively fetches related queries for each seed query and newly discovered
-        queries, up to `max_depth` BFS levels, while respecting `max_queries` and
-        `per_query_limit`. Stops if no new queries are found in a BFS layer
-        (convergence).
+        Iteratively fetches related queries for each seed query and newly
+        discovered queries, up to `max_depth` BFS levels, while respecting
+        `max_queries` and `per_query_limit`. Each level is fetched as one
+        concurrent batch where the provider allows. Stops if no new queries
+        are found in a BFS layer (convergence).
 
         Args:
             seed_queries (List[str]): Initial queries to expand.
@@ -59,45 +100,48 @@ class QuerySnowballer:
             List[str]: A list of unique queries collected, including the seeds.
 
         Notes:
-            - The function sleeps briefly (0.2s) between requests to throttle API calls.
             - Any errors from the provider are caught and logged; processing continues.
-            - Uses tqdm progress bars to indicate BFS depth processing.
         """
         visited: Set[str] = set()
-        queue = deque([(q, 0) for q in seed_queries])
-
-        last_run_size = 0  # track size from the previous check to detect convergence
-
-        while queue:
-            current_level_size = len(queue)
-            last_run_size = len(visited)
-
-            for _ in tqdm(range(current_level_size), desc=f"BFS Depth {queue[0][1]}"):
-                query, depth = queue.popleft()
-                if depth > self.max_depth or query in visited:
-                    continue
-                visited.add(query)
-                if len(visited) >= self.max_queries:
-                    print("[Snowballer] Reached maximum query limit.")
-                    return list(visited)
-                try:
-                    related = self.provider.get_related_queries(
-                        query, self.per_query_limit
-                    )
-                except Exception as e:
-                    print(f"[Snowballer] Error fetching '{query}': {e}")
-                    continue
+        pbar = tqdm(
+            total=self.max_queries, desc="Snowball", mininterval=0.5, leave=False
+        )
+        frontier = list(dict.fromkeys(seed_queries))
+        # Every query ever enqueued; O(1) membership instead of scanning the
+        # frontier, and never resets so a query is only queued once
+        queued: Set[str] = set(frontier)
+        depth = 0
+
+        while frontier and depth <= self.max_depth:
+            # Trim the level to the remaining global budget
+            remaining = self.max_queries - len(visited)
+            if remaining <= 0:
+                print("[Snowballer] Reached maximum query limit.")
+                break
 
-                for r in related:
-                    if r not in visited and r not in queue:
-                        queue.append((r, depth + 1))
+            level = [q for q in frontier if q not in visited][:remaining]
+            if not level:
+                break
+
+            visited.update(level)
+            pbar.update(len(level))
 
-                # Sleep to throttle a bit
-                time.sleep(0.2)
+            related_lists = self._fetch_level(level)
+
+            next_frontier = []
+            for related in related_lists:
+                for r in related:
+                    if r not in queued:
+                        queued.add(r)
+                        next_frontier.append(r)
 
             # Check convergence after finishing the entire BFS level
-            if len(visited) == last_run_size:
+            if not next_frontier:
                 print("[Snowballer] Converged — no new unique queries found.")
                 break
 
+            frontier = next_frontier
+            depth += 1
+
+        pbar.close()
         return list(visited)
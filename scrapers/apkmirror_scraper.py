@@ -2,17 +2,96 @@
 APKMirror.com scraper implementation.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict
 from urllib.parse import quote_plus, urljoin
 from scrapers.base_scraper import BaseAPKScraper
 from scrapers.base_scraper import APKResult
 import cloudscraper  # scraper to bypass cloudflare
-from bs4 import BeautifulSoup
-import logging
+import requests
+import requests_cache
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+import os
+import random
 import re
+import time
+from html import unescape
 
+from utils.logger import get_logger
 
-logger = logging.getLogger(__name__)
+# The shared queue-backed logger: INFO-level messages (formerly prints)
+# stay user-visible, unlike a bare module logger with no handler
+logger = get_logger(__name__)
+
+# Prefer the C-backed lxml parser (5-10x faster on these pages); fall
+# back to the stdlib parser when lxml isn't installed
+try:
+    import lxml  # noqa: F401
+
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+# Built once at import; __init__ only binds references
+_BASE_URL = "https://www.apkmirror.com"
+_SEARCH_URL = f"{_BASE_URL}/?post_type=app_release&searchtype=apk&s="
+_BROWSER_SPEC = {"browser": "chrome", "platform": "windows", "mobile": False}
+
+# Strainers short-circuit tree construction: only the anchors we query
+# get built, skipping head, nav, scripts and the rest of the page
+
+
+def _attr_has_token(token: str):
+    """Build a strainer matcher for multi-valued attributes (class/rel).
+
+    Exact-string matching would drop APKMirror's real markup, where the
+    buttons carry extra classes ("accent_bg btn ... downloadButton") and
+    final links extra rel tokens ("nofollow noopener"); match like find()
+    does, on the individual whitespace-separated token.
+    """
+
+    def _match(value) -> bool:
+        if not value:
+            return False
+        tokens = value.split() if isinstance(value, str) else value
+        return token in tokens
+
+    return _match
+
+
+_DL_BTN_STRAINER = SoupStrainer("a", {"class": _attr_has_token("downloadButton")})
+_FINAL_LINK_STRAINER = SoupStrainer("a", {"rel": _attr_has_token("nofollow")})
+_VARIANT_STRAINER = SoupStrainer("a", {"class": _attr_has_token("accent_color")})
+
+# Compiled once instead of round-tripping re's cache per row
+_VERSION_TAIL_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9.\-]*\d[A-Za-z0-9.\-]*")
+_VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+
+# Pulls the final download href straight out of the raw HTML; lookaheads
+# keep the match independent of attribute order. A regex scan is
+# microseconds against milliseconds for a full soup of a 100KB+ page
+_DIRECT_DL_RE = re.compile(
+    r'<a\b(?=[^>]*rel="[^"]*\bnofollow\b[^"]*")'
+    r'(?=[^>]*data-google-interstitial="false")'
+    r'[^>]*href="([^"]*?/wp-content/themes/APKMirror/download\.php[^"]*)"',
+    re.IGNORECASE,
+)
+
+
+class _CachedCloudScraper(requests_cache.CacheMixin, cloudscraper.CloudScraper):
+    """CloudScraper with a transparent on-disk HTTP cache.
+
+    App, variant and download pages are largely static over short horizons,
+    so warm re-runs answer from sqlite instead of going back to Cloudflare.
+    """
 
 
 class APKMirrorScraper(BaseAPKScraper):
@@ -28,6 +107,18 @@ class APKMirrorScraper(BaseAPKScraper):
         apk_counter (int): Counter to track the number the current app row, if apk download link is not found.
     """
 
+    # Compiled soupsieve selectors: each lookup is one select_one with no
+    # per-call selector parse or pattern-cache round trip
+    _SEL_DL_BTN = sv.compile(
+        "a.downloadButton[href^='/apk/']:not([href*='#downloads'])"
+    )
+    _SEL_DL_BTN_ANY = sv.compile("a.downloadButton")
+    _SEL_FINAL = sv.compile(
+        'a[rel="nofollow"][data-google-interstitial="false"]'
+        '[href*="/wp-content/themes/APKMirror/download.php"]'
+    )
+    _SEL_VARIANT = sv.compile("a.accent_color:has(> svg.tag-icon)")
+
     def __init__(
         self,
         timeout: int = 10,
@@ -37,14 +128,103 @@ class APKMirrorScraper(BaseAPKScraper):
     ):
         super().__init__(timeout, user_agent, max_results, rate_limit_delay)
 
-        self.base_url = "https://www.apkmirror.com"
-        self.search_url = f"{self.base_url}/?post_type=app_release&searchtype=apk&s="
+        self.base_url = _BASE_URL
+        self.search_url = _SEARCH_URL
+
+        cache_path = os.path.join(
+            os.path.expanduser("~"), ".cache", "apkmirror.sqlite"
+        )
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self.scraper = _CachedCloudScraper(
+            backend=requests_cache.backends.SQLiteCache(cache_path),
+            expire_after=3600,
+            allowable_methods=("GET",),
+            browser=_BROWSER_SPEC,
+        )
 
-        self.scraper = cloudscraper.create_scraper(
-            browser={"browser": "chrome", "platform": "windows", "mobile": False}
+        # Pool connections so the 3 hops per app row reuse one TLS session
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=32, pool_maxsize=32, pool_block=False
         )
+        self.scraper.mount("https://", adapter)
+        self.scraper.mount("http://", adapter)
+        self.headers["Connection"] = "keep-alive"
+
+        # The cloudscraper IS the persistent session here; drop the plain
+        # one from the base class so __exit__ closes the right object
+        self.session.close()
+        self.session = self.scraper
+
         self.cached_search = ""
         self.apk_counter = 0
+        # Rows parsed once per search page; indexed by apk_counter instead
+        # of re-parsing the whole page to pick the Nth row
+        self._cached_rows: Optional[List[Optional[APKResult]]] = None
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        retry=retry_if_exception_type(
+            (requests.HTTPError, requests.ConnectionError)
+        ),
+    )
+    def _fetch_search_page(self, search_url: str) -> str:
+        """Fetch a search page, retrying transient 429/5xx failures.
+
+        Args:
+            search_url (str): Fully encoded search URL.
+
+        Returns:
+            str: HTML of the search results page.
+        """
+        response = self.scraper.get(
+            search_url, headers=self.headers, timeout=self.timeout
+        )
+        if response.status_code == 429:
+            # Honor the server's backoff hint before tenacity retries
+            time.sleep(int(response.headers.get("Retry-After", "1")))
+        response.raise_for_status()
+        return response.text
+
+    def _get(self, url: str, headers: Optional[Dict] = None) -> requests.Response:
+        """GET with exponential backoff on transient failures.
+
+        Retries 429/502/503 responses and dropped connections up to three
+        attempts, honoring Retry-After when the server sends one, so a
+        single Cloudflare hiccup doesn't discard the whole candidate row.
+        The pooled adapter keeps retries on one keep-alive connection.
+
+        Args:
+            url (str): URL to fetch.
+            headers (Optional[Dict]): Headers overriding the defaults.
+
+        Returns:
+            requests.Response: The successful response.
+        """
+        response = None
+        last_exc: Optional[requests.RequestException] = None
+        for attempt in range(3):
+            try:
+                response = self.scraper.get(
+                    url, headers=headers or self.headers, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                last_exc = e
+                time.sleep(2**attempt + random.random())
+                continue
+            if response.status_code in (429, 502, 503):
+                retry_after = response.headers.get("Retry-After")
+                time.sleep(
+                    int(retry_after) if retry_after else 2**attempt + random.random()
+                )
+                continue
+            response.raise_for_status()
+            return response
+
+        if response is None and last_exc is not None:
+            raise last_exc
+        response.raise_for_status()
+        return response
 
     def search(self, query: str) -> Optional[APKResult]:
         """
@@ -61,17 +241,16 @@ class APKMirrorScraper(BaseAPKScraper):
 
         # Apply rate limiting
         self._rate_limit()
-        print(f"Query: {query}")
+        # Lazy formatting: no work unless DEBUG is actually enabled
+        logger.debug("Query: %s", query)
 
         search_url = self.search_url + quote_plus(query)
 
         try:
             if self.apk_counter == 0:
-                response = self.scraper.get(
-                    search_url, headers=self.headers, timeout=self.timeout
-                )
-                response.raise_for_status()
-                self.cached_search = response.text
+                self.cached_search = self._fetch_search_page(search_url)
+                # New page: the cached rows belong to the previous query
+                self._cached_rows = None
 
             return self._parse_search_results(self.cached_search)
 
@@ -89,7 +268,7 @@ class APKMirrorScraper(BaseAPKScraper):
         """
         parts = title.strip().split()
         # If last part looks like a version, remove it
-        if re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9.\-]*\d[A-Za-z0-9.\-]*", parts[-1]):
+        if _VERSION_TAIL_RE.fullmatch(parts[-1]):
             parts = parts[:-1]
         return " ".join(parts)
 
@@ -102,56 +281,58 @@ class APKMirrorScraper(BaseAPKScraper):
         Returns:
             List[APKResult]: List of APKResult objects parsed from the page.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        # Find all app rows
-        app_rows = soup.find_all("div", {"class": "appRow"})
-
-        if self.apk_counter >= len(app_rows):
-            print("No more app rows to process.")
+        if self._cached_rows is None:
+            # Lexbor parses and CSS-matches the rows in C; an order of
+            # magnitude faster than bs4 for this bulk row extraction.
+            # Parse every row once, then index by counter on later calls
+            tree = LexborHTMLParser(html)
+            parsed: List[Optional[APKResult]] = []
+            for app_row in tree.css("div.appRow"):
+                try:
+                    parsed.append(self._parse_app_row(app_row))
+                except Exception as e:
+                    logger.debug(f"Error parsing app row: {e}")
+                    parsed.append(None)
+            self._cached_rows = parsed
+
+        if self.apk_counter >= len(self._cached_rows):
+            logger.debug("No more app rows to process.")
             return None
-        app_row = app_rows[self.apk_counter]
-        try:
-            result = self._parse_app_row(app_row)
-            # Avoids duplicates based on base app name
-            if result is not None:
-                return result
-        except Exception as e:
-            logger.debug(f"Error parsing app row: {e}")
 
-        return None
+        return self._cached_rows[self.apk_counter]
 
     def _parse_app_row(self, app_row) -> Optional[APKResult]:
         """Parses a single app row element to extract app details.
 
         Args:
-            app_row (bs4.element.Tag): BeautifulSoup tag representing an app row.
+            app_row (selectolax.lexbor.LexborNode): Node representing an app row.
 
         Returns:
             Optional[APKResult]: APKResult object if parsing is successful; otherwise, None.
         """
         try:
-            # Extract title and link
-            title_elem = app_row.find("h5", {"class": "appRowTitle"})
-            if not title_elem:
-                return None
-
-            title = title_elem.text.strip()
-            link_elem = title_elem.find("a")
+            # Title and link live on the same anchor; one query walks the
+            # row once, and .text()/.attributes return plain strings
+            link_elem = app_row.css_first("h5.appRowTitle a")
             if not link_elem:
                 return None
 
-            app_url = urljoin(self.base_url, link_elem.get("href", ""))
+            title = link_elem.text().strip()
+            app_url = self._join(link_elem.attributes.get("href") or "")
 
-            # Extract version by taking the last word of the title and ensuring it consists of numbers and periods
-            version = (
-                title.strip().split()[-1]
-                if re.fullmatch(r"\d+(?:\.\d+)+", title.strip().split()[-1])
-                else None
-            )
+            # Extract version by taking the last word of the title and
+            # ensuring it consists of numbers and periods. rpartition is
+            # one C-level scan from the right, no throwaway word list
+            _, _, last = title.rpartition(" ")
+            version = last if _VERSION_RE.fullmatch(last or title) else None
+            if version is None:
+                # Some rows carry the version in the info slide instead
+                version_elem = app_row.css_first("span.infoSlide-value")
+                version = version_elem.text().strip() if version_elem else None
 
             # Extract developer
-            developer_elem = app_row.find("a", {"class": "byDeveloper"})
-            developer = developer_elem.text.strip() if developer_elem else None
+            developer_elem = app_row.css_first("a.byDeveloper")
+            developer = developer_elem.text().strip() if developer_elem else None
 
             return APKResult(
                 title=title,
@@ -161,7 +342,9 @@ class APKMirrorScraper(BaseAPKScraper):
                 version=version,
             )
 
-        except Exception as e:
+        except (AttributeError, KeyError) as e:
+            # Narrow on purpose: malformed rows are expected, real bugs
+            # (NameError etc.) should surface instead of being swallowed
             logger.debug(f"Error parsing app row details: {e}")
             return None
 
@@ -174,39 +357,57 @@ class APKMirrorScraper(BaseAPKScraper):
         Returns:
             Variant page URL or None
         """
-        # Step 1: Go to app page
+        # Step 1: Go to app page (retries transient failures)
         self._rate_limit()
-        response = self.scraper.get(APK_url, headers=self.headers, timeout=self.timeout)
-        # raises exception for HTTP errors
-        response.raise_for_status()
-
-        # Step 2: Use BeautifulSoup to parse the page
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = self._get(APK_url)
 
-        # Find the span child of the variant for the download link
-        apk_spans = soup.select("svg.icon.tag-icon")
+        # Step 2: Parse only the accent_color anchors; straining on the
+        # anchor (not the svg) keeps the parent-child pair in the tree
+        soup = BeautifulSoup(response.text, _PARSER, parse_only=_VARIANT_STRAINER)
 
-        apk_links = []
-        for span in apk_spans:
-            a = span.parent
-            if a.name == "a" and "accent_color" in a.get("class", []):
-                apk_links.append(a)
+        # One selector yields the first anchor carrying the APK tag icon;
+        # no intermediate list that's only ever indexed [0]
+        apk_link = self._SEL_VARIANT.select_one(soup)
 
-        if not apk_links:
+        if apk_link is None:
             logger.warning("No variant links found")
             return None
 
-        # Gets the first link
-        variant_page_url = urljoin(self.base_url, apk_links[0].get("href", ""))
+        return self._join(apk_link.get("href", ""))
+
+    def _join(self, href: str) -> str:
+        """Resolve an href against base_url, fast-pathing absolute paths.
+
+        Nearly every APKMirror href is site-absolute ("/apk/...",
+        "/wp-content/..."), where a concatenation replaces urljoin's
+        split/normalize/unsplit round trip. Anything else (including
+        protocol-relative "//") still goes through urljoin.
+        """
+        if href.startswith("/") and not href.startswith("//"):
+            return self.base_url + href
+        return urljoin(self.base_url, href)
 
-        return variant_page_url
+    def _prefetch_app_page(self, url: str) -> requests.Response:
+        """Fetch an app page for a future candidate on a worker thread.
 
-    def get_download_link(self, result: APKResult) -> Optional[str]:
+        Rate-limited inside the worker so prefetches draw from the same
+        token budget as foreground requests.
+        """
+        self._rate_limit()
+        return self._get(url)
+
+    def get_download_link(
+        self,
+        result: APKResult,
+        prefetched_response: Optional[requests.Response] = None,
+    ) -> Optional[str]:
         """
         Get direct download link for an APKMirror result.
 
         Args:
             result: APKResult from search
+            prefetched_response: App-page response already fetched by a
+                prefetch worker, skipping the first GET of the chain
 
         Returns:
             Direct download URL or None
@@ -218,25 +419,19 @@ class APKMirrorScraper(BaseAPKScraper):
             apk_url = result.url
 
             # Step 3: Go to download page and find download button
-            self._rate_limit()
-            download_response = self.scraper.get(
-                apk_url, headers=self.headers, timeout=self.timeout
-            )
-            download_response.raise_for_status()
+            if prefetched_response is not None:
+                download_response = prefetched_response
+            else:
+                self._rate_limit()
+                download_response = self._get(apk_url)
 
-            # Parses the download page
-            download_page_soup = BeautifulSoup(download_response.text, "html.parser")
+            # Parses the download page (only the downloadButton anchors)
+            download_page_soup = BeautifulSoup(
+                download_response.text, _PARSER, parse_only=_DL_BTN_STRAINER
+            )
 
             # find download button
-            download_button = download_page_soup.find(
-                "a",
-                {
-                    "class": "downloadButton",
-                    "href": lambda href: href
-                    and "#downloads" not in href
-                    and href.startswith("/apk/"),
-                },
-            )
+            download_button = self._SEL_DL_BTN.select_one(download_page_soup)
 
             if download_button is None:
                 logger.warning(
@@ -245,14 +440,13 @@ class APKMirrorScraper(BaseAPKScraper):
                 apk_url = self.get_variant_link(result.url)
 
                 self._rate_limit()
-                variant_response = self.scraper.get(
-                    apk_url, headers=self.headers, timeout=self.timeout
-                )
-                variant_response.raise_for_status()
+                variant_response = self._get(apk_url)
 
                 # Re-parse the new response
-                variant_soup = BeautifulSoup(variant_response.text, "html.parser")
-                download_button = variant_soup.find("a", {"class": "downloadButton"})
+                variant_soup = BeautifulSoup(
+                    variant_response.text, _PARSER, parse_only=_DL_BTN_STRAINER
+                )
+                download_button = self._SEL_DL_BTN_ANY.select_one(variant_soup)
 
                 if not download_button:
                     logger.error(
@@ -260,32 +454,31 @@ class APKMirrorScraper(BaseAPKScraper):
                     )
                     return None
 
-            download_page_url = urljoin(self.base_url, download_button.get("href", ""))
+            download_page_url = self._join(download_button.get("href", ""))
 
             # Step 4: Go to download page to get final link
             self._rate_limit()
             download_headers = self.headers.copy()
             download_headers["Referer"] = apk_url
-            download_response = self.scraper.get(
-                download_page_url, headers=self.headers, timeout=self.timeout
-            )
-            download_response.raise_for_status()
+            download_response = self._get(download_page_url, headers=download_headers)
 
-            download_soup = BeautifulSoup(download_response.text, "html.parser")
+            # Fast path: regex-scan the raw HTML for the direct href
+            match = _DIRECT_DL_RE.search(download_response.text)
+            if match:
+                direct_url = self._join(unescape(match.group(1)))
+                logger.info(f"Found direct download URL: {direct_url}")
+                return direct_url
 
-            # Find the actual download link
-            download_link = download_soup.find(
-                "a",
-                {
-                    "rel": "nofollow",
-                    "data-google-interstitial": "false",
-                    "href": lambda href: href
-                    and "/wp-content/themes/APKMirror/download.php" in href,
-                },
+            # Fallback: full parse in case the markup shifted
+            download_soup = BeautifulSoup(
+                download_response.text, _PARSER, parse_only=_FINAL_LINK_STRAINER
             )
 
+            # Find the actual download link
+            download_link = self._SEL_FINAL.select_one(download_soup)
+
             if download_link:
-                direct_url = urljoin(self.base_url, download_link.get("href", ""))
+                direct_url = self._join(download_link.get("href", ""))
                 logger.info(f"Found direct download URL: {direct_url}")
                 return direct_url
 
@@ -313,44 +506,82 @@ class APKMirrorScraper(BaseAPKScraper):
         """
         result: Optional[APKResult] = None
 
-        while True:
-            if self.apk_counter >= self.max_results:
-                print("Reached maximum number of attempts, stopping search.")
-                self.apk_counter = 0
-                return None, captured_results
-
-            result = self.search(query)
-
-            # Stop if search returned nothing
-            if result is None:
-                print("No result found.")
-                self.apk_counter = 0
-                return None, captured_results
-
-            base_name = self._extract_base_name(result.title).lower()
-            # If extracted download link and backup for this app then we don't need further copies
-            existing_result = captured_results.get(base_name)
-            if existing_result and existing_result.fallback_download_url:
-                self.apk_counter += 1
-                print("Duplicate found, skipping...")
-                continue
+        # Base names that already have both links; the hot skip branch
+        # below becomes one O(1) membership test instead of a dict get
+        # plus attribute chase per iteration
+        satisfied = frozenset(
+            name
+            for name, captured in captured_results.items()
+            if captured.fallback_download_url
+        )
 
-            # Try to get download link if we have a result and don't have enough download links for APK
-            download_link = self.get_download_link(result)
+        # App pages fetched ahead for upcoming rows, keyed by row index
+        prefetched: Dict[int, "object"] = {}
 
-            if download_link is None:
-                self.apk_counter += 1
-                continue
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            while True:
+                if self.apk_counter >= self.max_results:
+                    logger.info(
+                        "Reached maximum number of attempts, stopping search."
+                    )
+                    self.apk_counter = 0
+                    return None, captured_results
+
+                result = self.search(query)
+
+                # Stop if search returned nothing
+                if result is None:
+                    logger.info("No result found.")
+                    self.apk_counter = 0
+                    return None, captured_results
+
+                # Pipeline I/O: start fetching the next candidates' app
+                # pages while the current chain is being walked
+                if self._cached_rows:
+                    upper = min(self.apk_counter + 3, len(self._cached_rows))
+                    for idx in range(self.apk_counter + 1, upper):
+                        upcoming = self._cached_rows[idx]
+                        if upcoming is not None and idx not in prefetched:
+                            prefetched[idx] = executor.submit(
+                                self._prefetch_app_page, upcoming.url
+                            )
+
+                base_name = self._extract_base_name(result.title).lower()
+                # If extracted download link and backup for this app then we
+                # don't need further copies — checked before any network fetch
+                if base_name in satisfied:
+                    self.apk_counter += 1
+                    logger.debug("Duplicate found, skipping...")
+                    continue
+                existing_result = captured_results.get(base_name)
+
+                # Use the prefetched app page when it's already in flight
+                prefetched_response = None
+                future = prefetched.pop(self.apk_counter, None)
+                if future is not None:
+                    try:
+                        prefetched_response = future.result()
+                    except requests.RequestException:
+                        prefetched_response = None
+
+                # Try to get download link if we have a result and don't have enough download links for APK
+                download_link = self.get_download_link(
+                    result, prefetched_response=prefetched_response
+                )
 
-            if existing_result is None:
-                result.direct_download_url = download_link
-                captured_results[base_name] = result
-                self.apk_counter += 1
-                continue
-            else:
-                # Download and fallback URL found no need to search further
-                existing_result.fallback_download_url = download_link
-                break
+                if download_link is None:
+                    self.apk_counter += 1
+                    continue
+
+                if existing_result is None:
+                    result.direct_download_url = download_link
+                    captured_results[base_name] = result
+                    self.apk_counter += 1
+                    continue
+                else:
+                    # Download and fallback URL found no need to search further
+                    existing_result.fallback_download_url = download_link
+                    break
 
         self.apk_counter = 0
         return existing_result, captured_results
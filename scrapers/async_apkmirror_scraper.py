@@ -0,0 +1,336 @@
+"""
+Async APKMirror.com scraper built on httpx.
+
+Fetches the download-link chain for every candidate row concurrently instead
+of walking 3 sequential round trips per row. The Cloudflare challenge is
+still solved by cloudscraper on the initial search-page fetch; the resulting
+clearance cookies are forwarded into the shared httpx client.
+"""
+
+import asyncio
+import random
+from html import unescape
+from typing import List, Optional
+from urllib.parse import quote_plus
+
+import httpx
+from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+from scrapers.apkmirror_scraper import (
+    APKMirrorScraper,
+    _DIRECT_DL_RE,
+    _DL_BTN_STRAINER,
+    _FINAL_LINK_STRAINER,
+    _PARSER,
+    _VARIANT_STRAINER,
+)
+from scrapers.base_scraper import APKResult
+from utils.logger import get_logger
+from utils.rate_limiter import AsyncTokenBucket
+
+
+logger = get_logger(__name__)
+
+
+class AsyncAPKMirrorScraper(APKMirrorScraper):
+    """
+    Asyncio variant of APKMirrorScraper.
+
+    Reuses the parent's row/HTML parsing but performs all HTTP fetches on a
+    shared httpx.AsyncClient, gathering the per-row download-link chains
+    under a politeness semaphore.
+
+    Attributes:
+        max_concurrency (int): Maximum in-flight download-link fetches.
+    """
+
+    def __init__(self, *args, max_concurrency: int = 5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        # Async twin of the base class's bucket: one global request rate
+        # shared by every in-flight coroutine, paid with asyncio.sleep
+        self._async_limiter = (
+            AsyncTokenBucket(rate=1.0 / self.rate_limit_delay, burst=1)
+            if self.rate_limit_delay > 0
+            else None
+        )
+
+    async def _async_rate_limit(self):
+        """Await until the shared token bucket admits another request."""
+        if self._async_limiter is not None:
+            await self._async_limiter.acquire()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Lazily build the shared client, seeded with cloudscraper cookies."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                headers=self.headers,
+                cookies=dict(self.scraper.cookies),
+                follow_redirects=True,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared httpx client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_text(self, url: str, headers: Optional[dict] = None) -> str:
+        """GET a page with exponential backoff on transient failures.
+
+        The async twin of the sync scraper's _get: retries 429/502/503
+        responses and transport errors up to three attempts, honoring
+        Retry-After, so a Cloudflare hiccup doesn't drop the row.
+        """
+        client = await self._get_client()
+        response = None
+        last_exc: Optional[httpx.TransportError] = None
+        for attempt in range(3):
+            await self._async_rate_limit()
+            try:
+                response = await client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                last_exc = e
+                await asyncio.sleep(2**attempt + random.random())
+                continue
+            if response.status_code in (429, 502, 503):
+                retry_after = response.headers.get("Retry-After")
+                await asyncio.sleep(
+                    int(retry_after) if retry_after else 2**attempt + random.random()
+                )
+                continue
+            response.raise_for_status()
+            return response.text
+
+        if response is None and last_exc is not None:
+            raise last_exc
+        response.raise_for_status()
+        return response.text
+
+    def _parse_all_rows(self, html: str) -> List[APKResult]:
+        """Parse every app row on a search page, up to max_results."""
+        tree = LexborHTMLParser(html)
+        app_rows = tree.css("div.appRow")[: self.max_results]
+
+        results = []
+        for app_row in app_rows:
+            try:
+                result = self._parse_app_row(app_row)
+            except Exception as e:
+                logger.debug(f"Error parsing app row: {e}")
+                continue
+            if result is not None:
+                results.append(result)
+        return results
+
+    async def search(self, query: str) -> List[APKResult]:
+        """
+        Search APKMirror for APKs, returning every parsed result row.
+
+        The search page itself goes through cloudscraper (in a worker
+        thread) so Cloudflare challenges get solved; the clearance cookies
+        are then shared with the async client.
+
+        Args:
+            query: Search query
+
+        Returns:
+            List of APKResult objects
+        """
+        search_url = self.search_url + quote_plus(query)
+
+        await self._async_rate_limit()
+        try:
+            response = await asyncio.to_thread(
+                self.scraper.get, search_url, headers=self.headers, timeout=self.timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            # Mirror the sync search(): a failed page is this query's loss,
+            # never the whole gather's
+            logger.error(f"Error searching APKMirror: {e}")
+            return []
+
+        # Forward any newly issued clearance cookies to the async client
+        client = await self._get_client()
+        for cookie in self.scraper.cookies:
+            client.cookies.set(cookie.name, cookie.value, domain=cookie.domain)
+
+        return self._parse_all_rows(response.text)
+
+    async def get_variant_link(self, APK_url: str) -> Optional[str]:
+        """
+        Get variant link from APK page.
+
+        Args:
+            APK_url: URL of the APK page
+        Returns:
+            Variant page URL or None
+        """
+        html = await self._fetch_text(APK_url)
+        # Straining on the anchor (not the svg) keeps the pair in the tree
+        soup = BeautifulSoup(html, _PARSER, parse_only=_VARIANT_STRAINER)
+
+        apk_link = self._SEL_VARIANT.select_one(soup)
+
+        if apk_link is None:
+            logger.warning("No variant links found")
+            return None
+
+        return self._join(apk_link.get("href", ""))
+
+    async def get_download_link(self, result: APKResult) -> Optional[str]:
+        """
+        Get direct download link for an APKMirror result.
+
+        Args:
+            result: APKResult from search
+
+        Returns:
+            Direct download URL or None
+        """
+        if result.source != "apkmirror":
+            return None
+
+        try:
+            apk_url = result.url
+            html = await self._fetch_text(apk_url)
+
+            download_page_soup = BeautifulSoup(
+                html, _PARSER, parse_only=_DL_BTN_STRAINER
+            )
+            download_button = self._SEL_DL_BTN.select_one(download_page_soup)
+
+            if download_button is None:
+                logger.warning(
+                    "download button not found, attempting to get variant link..."
+                )
+                apk_url = await self.get_variant_link(result.url)
+                if apk_url is None:
+                    return None
+
+                variant_html = await self._fetch_text(apk_url)
+                variant_soup = BeautifulSoup(
+                    variant_html, _PARSER, parse_only=_DL_BTN_STRAINER
+                )
+                download_button = self._SEL_DL_BTN_ANY.select_one(variant_soup)
+
+                if not download_button:
+                    logger.error(
+                        "Download button still not found after getting variant link"
+                    )
+                    return None
+
+            download_page_url = self._join(download_button.get("href", ""))
+
+            download_headers = self.headers.copy()
+            download_headers["Referer"] = apk_url
+            download_html = await self._fetch_text(
+                download_page_url, headers=download_headers
+            )
+
+            # Fast path: regex-scan the raw HTML for the direct href
+            match = _DIRECT_DL_RE.search(download_html)
+            if match:
+                direct_url = self._join(unescape(match.group(1)))
+                logger.info(f"Found direct download URL: {direct_url}")
+                return direct_url
+
+            download_soup = BeautifulSoup(
+                download_html, _PARSER, parse_only=_FINAL_LINK_STRAINER
+            )
+            download_link = self._SEL_FINAL.select_one(download_soup)
+
+            if download_link:
+                direct_url = self._join(download_link.get("href", ""))
+                logger.info(f"Found direct download URL: {direct_url}")
+                return direct_url
+
+            logger.warning("Direct download link not found")
+            return None
+
+        except Exception as e:
+            logger.error(f"Error getting download link: {e}")
+            return None
+
+    async def search_and_download(
+        self, query: str, captured_results: dict
+    ) -> tuple[Optional[APKResult], dict]:
+        """
+        Search for an APK and get its download link in one call.
+
+        Candidate rows whose base name already has both links captured are
+        dropped before any HTTP request, mirroring the sync loop's skip
+        branch. The remaining rows' download-link chains run concurrently
+        under a semaphore but are consumed in row order — the first link
+        found becomes the direct URL, the second the fallback — and the
+        still-pending chains are cancelled once a pair is complete.
+
+        Args:
+            query: Search query
+            captured_results: Dict of already captured results to avoid duplicates
+
+        Returns:
+            Tuple containing:
+                - APKResult with download link, or None if not found
+                - Updated captured_results dictionary
+        """
+        results = await self.search(query)
+        if not results:
+            logger.info("No result found.")
+            return None, captured_results
+
+        # Dedup before any network fetch: base names that already hold a
+        # direct and fallback link need no further copies
+        satisfied = frozenset(
+            name
+            for name, captured in captured_results.items()
+            if captured.fallback_download_url
+        )
+        candidates = [
+            result
+            for result in results
+            if self._extract_base_name(result.title).lower() not in satisfied
+        ]
+        if not candidates:
+            logger.debug("All rows already captured, skipping...")
+            return None, captured_results
+
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded_link(result):
+            async with sem:
+                return await self.get_download_link(result)
+
+        tasks = [asyncio.ensure_future(_bounded_link(r)) for r in candidates]
+
+        completed = None
+        try:
+            for result, task in zip(candidates, tasks):
+                link = await task
+                if link is None:
+                    continue
+
+                base_name = self._extract_base_name(result.title).lower()
+                existing_result = captured_results.get(base_name)
+
+                if existing_result is None:
+                    result.direct_download_url = link
+                    captured_results[base_name] = result
+                elif existing_result.fallback_download_url is None:
+                    existing_result.fallback_download_url = link
+                    completed = existing_result
+                    break
+        finally:
+            # Later rows' chains are moot once a pair is found (or on error)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return completed, captured_results
@@ -6,8 +6,27 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import List, Optional, Dict
 
+import operator
 
-@dataclass
+import requests
+
+from utils.rate_limiter import TokenBucket
+
+# Serialized fields in output order; attrgetter fetches them in one
+# C-level call instead of seven attribute lookups per to_dict
+_FIELDS = (
+    "title",
+    "url",
+    "source",
+    "description",
+    "version",
+    "developer",
+    "direct_download_url",
+)
+_GET_FIELDS = operator.attrgetter(*_FIELDS)
+
+
+@dataclass(slots=True)
 class APKResult:
     """Represents a single APK search result.
 
@@ -33,15 +52,7 @@ class APKResult:
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization."""
-        return {
-            "title": self.title,
-            "url": self.url,
-            "source": self.source,
-            "description": self.description,
-            "version": self.version,
-            "developer": self.developer,
-            "direct_download_url": self.direct_download_url,
-        }
+        return dict(zip(_FIELDS, _GET_FIELDS(self)))
 
 
 class BaseAPKScraper(ABC):
@@ -78,7 +89,17 @@ class BaseAPKScraper(ABC):
         )
         self.headers = {"User-Agent": self.user_agent}
 
-        self.session = None
+        # Persistent session so sequential requests reuse one TLS
+        # connection; subclasses may swap in a more capable Session
+        self.session = requests.Session()
+
+        # One request per rate_limit_delay seconds on average, but time
+        # already spent waiting on responses counts against the budget
+        self._limiter = (
+            TokenBucket(rate=1.0 / rate_limit_delay, burst=1)
+            if rate_limit_delay > 0
+            else None
+        )
 
     @abstractmethod
     def search(self, query: str) -> Optional[APKResult]:
@@ -130,12 +151,20 @@ class BaseAPKScraper(ABC):
         raise NotImplementedError
 
     def _rate_limit(self):
-        """Pause execution for `rate_limit_delay` seconds to prevent server blocking."""
-        import time
+        """Block until the token bucket admits another request.
+
+        Unlike a fixed sleep, the bucket only waits when the budget is
+        actually spent, so requests that follow a slow response proceed
+        immediately and concurrent workers share one global rate.
+        """
+        if self._limiter is not None:
+            self._limiter.acquire()
 
-        time.sleep(self.rate_limit_delay)
+    def __enter__(self):
+        """Enter a context that closes the HTTP session on exit."""
+        return self
 
-    def __exit__(self):
+    def __exit__(self, exc_type=None, exc=None, tb=None):
         """Close the HTTP session if it exists."""
         if self.session:
             self.session.close()
@@ -1,7 +1,9 @@
 # utils/config.py
 import os
+
 from dotenv import load_dotenv
 
+# Module-level, so .env is parsed once per process at first import
 dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
 load_dotenv(dotenv_path)
 
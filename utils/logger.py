@@ -0,0 +1,40 @@
+# utils/logger.py
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+
+def get_logger(name: str = "mindtheapp") -> logging.Logger:
+    """Return a logger that hands records off through a shared queue.
+
+    Worker threads enqueue records without blocking on terminal I/O; a single
+    QueueListener thread drains the queue into a StreamHandler, so parallel
+    downloaders/extractors never contend on the stdout lock.
+
+    Parameters:
+    name: Logger name, nested under the shared "mindtheapp" root.
+
+    Returns:
+    A configured logging.Logger instance.
+    """
+    global _listener
+
+    root = logging.getLogger("mindtheapp")
+    if _listener is None:
+        log_queue = queue.Queue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(logging.INFO)
+
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    if name == "mindtheapp":
+        return root
+    return root.getChild(name)
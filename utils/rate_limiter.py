@@ -0,0 +1,75 @@
+# utils/rate_limiter.py
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter that only sleeps when the budget is spent.
+
+    Tokens refill continuously at `rate` per second up to `burst`. acquire()
+    takes one token and sleeps just long enough for the next refill when the
+    bucket is empty — unlike a fixed inter-request sleep, time already spent
+    waiting on a slow response counts against the budget.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (int): Maximum tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking until the rate budget allows it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            # May go negative: the deficit is the time we owe the bucket
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AsyncTokenBucket:
+    """Asyncio twin of TokenBucket for coroutine-based callers.
+
+    Same lazy-refill accounting, but the refill runs under an
+    asyncio.Lock and the deficit is paid with await asyncio.sleep so the
+    event loop keeps running other tasks while one waits.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (int): Maximum tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Take one token, awaiting until the rate budget allows it."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            # May go negative: the deficit is the time we owe the bucket
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+        if wait > 0:
+            await asyncio.sleep(wait)